@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+
+"""
+Minimal MCP server exposing a few "complex math" tools over stdio.
+
+The server speaks newline-delimited JSON-RPC 2.0 on stdin/stdout, the same
+framing the MCP stdio transport uses. Tools:
+
+- calculate: evaluate an arithmetic expression against a small whitelist of
+  math functions and constants
+- quadratic: real or complex roots of a*x^2 + b*x + c
+- matrix_det: determinant of a 2x2 or 3x3 matrix
+
+Expressions are parsed with `ast`, validated against a whitelist, and then
+compiled to a Python code object that is cached per expression string, so
+repeated calls with the same expression (the common MCP usage pattern) skip
+the AST entirely and run as plain bytecode.
+"""
+
+import ast
+import cmath
+import json
+import math
+import sys
+from functools import lru_cache
+
+# orjson serializes straight to bytes with a much faster encoder; fall back to
+# a compact stdlib encoding when it is not installed.
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+
+    def _sanitize_nonfinite(obj):
+        if isinstance(obj, float):
+            return obj if math.isfinite(obj) else None
+        if isinstance(obj, list):
+            return [_sanitize_nonfinite(x) for x in obj]
+        if isinstance(obj, dict):
+            return {k: _sanitize_nonfinite(v) for k, v in obj.items()}
+        return obj
+
+    def _dumps(obj) -> bytes:
+        # allow_nan=False keeps the output RFC 8259 clean; the rare payload
+        # carrying nan/inf gets them mapped to null, matching orjson.
+        try:
+            return json.dumps(obj, separators=(",", ":"), allow_nan=False).encode()
+        except ValueError:
+            return json.dumps(
+                _sanitize_nonfinite(obj), separators=(",", ":"), allow_nan=False
+            ).encode()
+
+    _loads = json.loads
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# numba is a heavyweight optional dependency; when present, expressions that
+# are evaluated repeatedly get compiled to native code (see _jit_compile).
+try:
+    import numba
+except ImportError:
+    numba = None
+
+_SAFE_FUNCS = {
+    "abs": abs,
+    "acos": math.acos,
+    "asin": math.asin,
+    "atan": math.atan,
+    "atan2": math.atan2,
+    "ceil": math.ceil,
+    "cos": math.cos,
+    "exp": math.exp,
+    "floor": math.floor,
+    "log": math.log,
+    "log10": math.log10,
+    "log2": math.log2,
+    "pow": pow,
+    "sin": math.sin,
+    "sqrt": math.sqrt,
+    "tan": math.tan,
+}
+
+_SAFE_CONSTS = {
+    "e": math.e,
+    "inf": math.inf,
+    "pi": math.pi,
+    "tau": math.tau,
+}
+
+# Evaluation environment for compiled expressions; merged once so no dict is
+# assembled per call.
+_SAFE_ENV = {**_SAFE_FUNCS, **_SAFE_CONSTS}
+
+
+# Operator whitelists, built once at module load. The validator dispatches on
+# type(node) through _VALIDATORS below, so each node costs one dict lookup
+# instead of a cascade of isinstance checks.
+_ALLOWED_BINOPS = frozenset({ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod})
+_ALLOWED_UNOPS = frozenset({ast.UAdd, ast.USub})
+
+
+def _validate_expression(n: ast.Expression) -> None:
+    _validate(n.body)
+
+
+def _validate_constant(n: ast.Constant) -> None:
+    if type(n.value) not in (int, float):
+        raise ValueError(f"unsupported constant: {n.value!r}")
+
+
+def _validate_unaryop(n: ast.UnaryOp) -> None:
+    if type(n.op) not in _ALLOWED_UNOPS:
+        raise ValueError(f"unsupported operator: {type(n.op).__name__}")
+    _validate(n.operand)
+
+
+def _validate_binop(n: ast.BinOp) -> None:
+    if type(n.op) not in _ALLOWED_BINOPS:
+        raise ValueError(f"unsupported operator: {type(n.op).__name__}")
+    _validate(n.left)
+    _validate(n.right)
+
+
+def _validate_name(n: ast.Name) -> None:
+    if n.id not in _SAFE_CONSTS:
+        raise ValueError(f"unknown name: {n.id}")
+
+
+def _validate_call(n: ast.Call) -> None:
+    if type(n.func) is not ast.Name or n.func.id not in _SAFE_FUNCS:
+        raise ValueError("only whitelisted function calls are allowed")
+    if n.keywords:
+        raise ValueError("keyword arguments are not allowed")
+    for arg in n.args:
+        _validate(arg)
+
+
+_VALIDATORS = {
+    ast.Expression: _validate_expression,
+    ast.Constant: _validate_constant,
+    ast.UnaryOp: _validate_unaryop,
+    ast.BinOp: _validate_binop,
+    ast.Name: _validate_name,
+    ast.Call: _validate_call,
+}
+
+
+def _validate(n: ast.AST) -> None:
+    """Reject anything outside the arithmetic whitelist before compiling."""
+    try:
+        handler = _VALIDATORS[type(n)]
+    except KeyError:
+        raise ValueError(f"unsupported syntax: {type(n).__name__}") from None
+    handler(n)
+
+
+@lru_cache(maxsize=1024)
+def _compile_expr(expr: str):
+    """Parse, validate, and compile an expression to a code object.
+
+    The cache means an expression is parsed and validated at most once;
+    subsequent calls with the same string go straight to `eval` on the
+    compiled bytecode.
+    """
+    tree = ast.parse(expr, mode="eval")
+    _validate(tree)
+    return compile(tree, "<expr>", "eval")
+
+
+# Expressions evaluated at least once; an expression goes through
+# _jit_compile only from its second use on, so one-shot expressions never pay
+# the JIT cost.
+_jit_seen: set = set()
+
+
+@lru_cache(maxsize=1024)
+def _jit_compile(expr: str):
+    """Compile a validated expression to native code via numba, or None.
+
+    The expression is wrapped in a zero-argument function whose globals are
+    _SAFE_ENV (numba understands the math-module functions in it) and run
+    once to force compilation. The callable is only trusted if its result
+    matches the interpreted one: numba types integer arithmetic as int64
+    (wrapping where CPython ints are unbounded, e.g. 2**100) and follows IEEE
+    where CPython raises (float division by zero yields inf instead of
+    ZeroDivisionError). Any rejection or mismatch is cached as None and the
+    expression stays on the bytecode path.
+    """
+    if numba is None:
+        return None
+    ns = dict(_SAFE_ENV)
+    try:
+        exec(compile(f"def _f():\n    return {expr}\n", "<jit-expr>", "exec"), ns)
+        fn = numba.njit(ns["_f"])
+        jitted = float(fn())
+        expected = float(eval(_compile_expr(expr), {"__builtins__": {}}, _SAFE_ENV))
+        if jitted != expected and not (math.isnan(jitted) and math.isnan(expected)):
+            return None
+        return fn
+    except Exception:
+        return None
+
+
+def _eval_expr(expr: str) -> float:
+    code = _compile_expr(expr)
+    if numba is not None:
+        if expr in _jit_seen:
+            # Compiled once by the lru_cache; a numba rejection is cached as
+            # None so unsupported expressions are not retried.
+            fn = _jit_compile(expr)
+            if fn is not None:
+                return float(fn())
+        else:
+            if len(_jit_seen) > 4096:
+                _jit_seen.clear()
+            _jit_seen.add(expr)
+    return float(eval(code, {"__builtins__": {}}, _SAFE_ENV))
+
+
+# Literals repeated across the tool schemas, interned so the dicts built in
+# tool_schemas() share key storage and hash-compare by identity.
+_S = {
+    k: sys.intern(k)
+    for k in (
+        "type",
+        "object",
+        "string",
+        "number",
+        "array",
+        "properties",
+        "required",
+        "items",
+        "description",
+        "name",
+        "inputSchema",
+    )
+}
+
+
+def tool_schemas() -> list:
+    return [
+        {
+            _S["name"]: "calculate",
+            _S["description"]: "Evaluate an arithmetic expression. Supports +, -, *, /, %, **, "
+            "common math functions (sin, cos, sqrt, log, ...) and the constants pi, e, tau, inf.",
+            _S["inputSchema"]: {
+                _S["type"]: _S["object"],
+                _S["properties"]: {
+                    "expr": {
+                        _S["type"]: _S["string"],
+                        _S["description"]: "Expression to evaluate, e.g. 'sin(pi / 4) ** 2'.",
+                    },
+                },
+                _S["required"]: ["expr"],
+            },
+        },
+        {
+            _S["name"]: "quadratic",
+            _S["description"]: "Solve a*x^2 + b*x + c = 0. Returns real or complex roots.",
+            _S["inputSchema"]: {
+                _S["type"]: _S["object"],
+                _S["properties"]: {
+                    "a": {_S["type"]: _S["number"], _S["description"]: "Quadratic coefficient (non-zero)."},
+                    "b": {_S["type"]: _S["number"], _S["description"]: "Linear coefficient."},
+                    "c": {_S["type"]: _S["number"], _S["description"]: "Constant term."},
+                },
+                _S["required"]: ["a", "b", "c"],
+            },
+        },
+        {
+            _S["name"]: "matrix_det",
+            _S["description"]: "Determinant of a square matrix. Any size with numpy installed; "
+            "2x2 and 3x3 otherwise.",
+            _S["inputSchema"]: {
+                _S["type"]: _S["object"],
+                _S["properties"]: {
+                    "matrix": {
+                        _S["type"]: _S["array"],
+                        _S["items"]: {_S["type"]: _S["array"], _S["items"]: {_S["type"]: _S["number"]}},
+                        _S["description"]: "Square matrix given as rows of numbers.",
+                    },
+                },
+                _S["required"]: ["matrix"],
+            },
+        },
+    ]
+
+
+# Computed once; every consumer shares this object rather than rebuilding the
+# schema dicts.
+_TOOL_SCHEMAS = tool_schemas()
+
+
+def write_response(obj) -> None:
+    # Write bytes directly so the text layer never re-encodes the payload.
+    out = sys.stdout.buffer
+    out.write(_dumps(obj) + b"\n")
+    out.flush()
+
+
+def _ok(id_val, result) -> None:
+    write_response({"jsonrpc": "2.0", "id": id_val, "result": result})
+
+
+def _err(id_val, code: int, message: str) -> None:
+    write_response({"jsonrpc": "2.0", "id": id_val, "error": {"code": code, "message": message}})
+
+
+# The initialize and tools/list results are static, so their JSON is built
+# once at import time; per request we only splice the id into the envelope.
+_ID_PREFIX = b'{"jsonrpc":"2.0","id":'
+_INITIALIZE_SUFFIX = b',"result":' + _dumps(
+    {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {"tools": {}},
+        "serverInfo": {"name": "complex-math", "version": "0.1.0"},
+    }
+) + b"}\n"
+_TOOLS_LIST_SUFFIX = b',"result":' + _dumps({"tools": _TOOL_SCHEMAS}) + b"}\n"
+
+
+def _write_prebuilt(id_val, suffix: bytes) -> None:
+    out = sys.stdout.buffer
+    out.write(_ID_PREFIX + _dumps(id_val) + suffix)
+    out.flush()
+
+
+def handle_initialize(id_val) -> None:
+    _write_prebuilt(id_val, _INITIALIZE_SUFFIX)
+
+
+def handle_tools_list(id_val) -> None:
+    _write_prebuilt(id_val, _TOOLS_LIST_SUFFIX)
+
+
+def _ok_raw(id_val, result_bytes: bytes) -> None:
+    """Like _ok, but the result is already serialized JSON."""
+    out = sys.stdout.buffer
+    out.write(_ID_PREFIX + _dumps(id_val) + b',"result":' + result_bytes + b"}\n")
+    out.flush()
+
+
+def _text_result(text: str, structured_json: bytes) -> bytes:
+    # The result envelope has a fixed shape, so it is assembled from bytes
+    # fragments rather than built as nested dicts and re-serialized.
+    return (
+        b'{"content":[{"type":"text","text":'
+        + _dumps(text)
+        + b'}],"structuredContent":'
+        + structured_json
+        + b"}"
+    )
+
+
+def call_calculate(arguments: dict) -> bytes:
+    expr = arguments.get("expr")
+    # The schema makes expr a string already; only coerce the odd client that
+    # sends something else, so the common case skips a call.
+    val = _eval_expr(expr if type(expr) is str else str(expr))
+    if math.isfinite(val):
+        # Convert the float to text once: repr round-trips finite floats, so
+        # the same digits serve the message and the raw JSON payload.
+        s = repr(val)
+        return _text_result("result: " + s, b'{"result":' + s.encode() + b"}")
+    # repr of nan/inf is not valid JSON; both serializer paths map them to null.
+    return _text_result(f"result: {val}", b'{"result":' + _dumps(val) + b"}")
+
+
+def call_quadratic(arguments: dict) -> bytes:
+    a, b, c = (float(arguments[k]) for k in ("a", "b", "c"))
+    if a == 0.0:
+        raise ValueError("coefficient 'a' must be non-zero")
+    # cmath.sqrt keeps the root computation branch-free: both arms share one
+    # code path and only the output formatting inspects the imaginary part.
+    s = cmath.sqrt(b * b - 4.0 * a * c)
+    inv = 0.5 / a
+    r1 = (-b + s) * inv
+    r2 = (-b - s) * inv
+    if r1.imag == 0.0:
+        x1, x2 = r1.real, r2.real
+        if math.isfinite(x1) and math.isfinite(x2):
+            # repr() of a finite float round-trips through JSON, so the roots
+            # can be spliced into the payload without a serializer pass.
+            return _text_result(
+                f"roots: {x1}, {x2}", f'{{"roots":[{x1!r},{x2!r}]}}'.encode()
+            )
+        # Overflowed roots (tiny 'a', huge 'b') stay on the real branch but
+        # repr as inf/nan, which is not valid JSON; both serializer paths map
+        # them to null.
+        return _text_result(
+            f"roots: {x1}, {x2}", b'{"roots":' + _dumps([x1, x2]) + b"}"
+        )
+    return _text_result(
+        f"roots: {r1.real}{r1.imag:+}i, {r2.real}{r2.imag:+}i",
+        b'{"roots":'
+        + _dumps([{"re": r1.real, "im": r1.imag}, {"re": r2.real, "im": r2.imag}])
+        + b"}",
+    )
+
+
+def _det2(m) -> float:
+    return m[0][0] * m[1][1] - m[0][1] * m[1][0]
+
+
+def _det3(m) -> float:
+    a, b, c = m[0]
+    d, e, f = m[1]
+    g, h, i = m[2]
+    return a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+
+
+def call_matrix_det(arguments: dict) -> bytes:
+    m = arguments.get("matrix")
+    if (
+        not isinstance(m, list)
+        or len(m) < 2
+        or any(not isinstance(row, list) or len(row) != len(m) for row in m)
+        or any(not isinstance(x, (int, float)) for row in m for x in row)
+    ):
+        raise ValueError("matrix must be a square array of numbers, at least 2x2")
+    if np is None:
+        if len(m) == 2:
+            det = float(_det2(m))
+        elif len(m) == 3:
+            det = float(_det3(m))
+        else:
+            raise ValueError("matrices larger than 3x3 require numpy") from None
+        return _text_result(f"determinant: {det}", b'{"determinant":' + _dumps(det) + b"}")
+    arr = np.asarray(m, dtype=np.float64)
+    if arr.shape == (2, 2):
+        det = arr[0, 0] * arr[1, 1] - arr[0, 1] * arr[1, 0]
+    elif arr.shape == (3, 3):
+        # Inlined cofactor expansion on the flat array pipelines better than
+        # the general LU factorization for a matrix this small.
+        a, b, c, d, e, f, g, h, i = arr.ravel()
+        det = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+    else:
+        det = np.linalg.det(arr)
+    det = float(det)
+    return _text_result(f"determinant: {det}", b'{"determinant":' + _dumps(det) + b"}")
+
+
+_TOOLS = {
+    "calculate": call_calculate,
+    "quadratic": call_quadratic,
+    "matrix_det": call_matrix_det,
+}
+
+
+def handle_tools_call(id_val, params: dict) -> None:
+    name = params.get("name")
+    tool = _TOOLS.get(name)
+    if tool is None:
+        _err(id_val, -32602, f"unknown tool: {name}")
+        return
+    try:
+        result_bytes = tool(params.get("arguments") or {})
+    except Exception as e:
+        _err(id_val, -32603, str(e))
+        return
+    _ok_raw(id_val, result_bytes)
+
+
+def _dispatch(frame: bytes) -> None:
+    try:
+        msg = _loads(frame)
+    except ValueError:
+        return
+    if not isinstance(msg, dict):
+        # Valid JSON but not a request object (e.g. a batch array or a bare
+        # scalar); skip it like an unparseable frame instead of letting an
+        # AttributeError take down the read loop.
+        return
+    method = msg.get("method")
+    id_val = msg.get("id")
+    if method == "initialize":
+        handle_initialize(id_val)
+    elif method == "tools/list":
+        handle_tools_list(id_val)
+    elif method == "tools/call":
+        handle_tools_call(id_val, msg.get("params") or {})
+    elif id_val is not None:
+        _err(id_val, -32601, f"unknown method: {method}")
+
+
+def main() -> int:
+    # Read stdin in large chunks and split frames on the newline delimiter
+    # ourselves: pipelined clients cost one read() per burst rather than one
+    # Python-level loop iteration (and UTF-8 decode) per message.
+    stdin = sys.stdin.buffer
+    buf = b""
+    while True:
+        chunk = stdin.read1(65536)
+        if not chunk:
+            break
+        buf += chunk
+        if b"\n" not in chunk:
+            continue
+        *frames, buf = buf.split(b"\n")
+        for frame in frames:
+            if frame.strip():
+                _dispatch(frame)
+    if buf.strip():
+        _dispatch(buf)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
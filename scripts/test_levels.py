@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+"""
+Run the Rust test suite and summarize libtest results across crates.
+
+Runs `cargo test` for the codex-rs workspace once and totals the per-crate
+`test result:` summary lines. With --target-pattern, the same run's per-test
+lines are filtered in Python to also report how the matching subset fared, so
+CI can gate on a focused group of tests without paying for a second
+build-and-run cycle.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+CODEX_RS = Path(__file__).resolve().parent.parent / "codex-rs"
+
+# Compiled once and matched against raw bytes so multi-MB cargo output is
+# never decoded just to find the summary lines.
+_RESULT_RE = re.compile(
+    rb"test result: (ok|FAILED)\. (\d+) passed; (\d+) failed; (\d+) ignored"
+)
+
+# Per-test outcome lines from stable libtest's default (pretty) format.
+_TEST_LINE_RE = re.compile(rb"^test (\S+) \.\.\. (ok|FAILED|ignored)\s*$", re.MULTILINE)
+
+
+def run_tests(target_pattern=None) -> tuple:
+    """Run `cargo test` once; return (passed, failed, tgt_passed, tgt_failed, returncode).
+
+    Output is streamed: each line is echoed and matched as it arrives, so the
+    suite's output is traversed once and never held in memory, and progress
+    is visible while the tests run. The target counts are derived from the
+    same run by matching per-test outcome lines against target_pattern; they
+    are (0, 0) when no pattern is given.
+    """
+    tgt_re = re.compile(target_pattern.encode()) if target_pattern is not None else None
+    proc = subprocess.Popen(
+        ["cargo", "test"],
+        cwd=CODEX_RS,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    out = sys.stdout.buffer
+    passed = failed = tgt_passed = tgt_failed = 0
+    for line in proc.stdout:
+        # Echoed as bytes; decoding and re-encoding the stream would only
+        # burn time on large suites.
+        out.write(line)
+        m = _RESULT_RE.search(line)
+        if m:
+            passed += int(m.group(2))
+            failed += int(m.group(3))
+            continue
+        if tgt_re is None:
+            continue
+        m = _TEST_LINE_RE.search(line)
+        if m and tgt_re.search(m.group(1)):
+            if m.group(2) == b"ok":
+                tgt_passed += 1
+            elif m.group(2) == b"FAILED":
+                tgt_failed += 1
+    out.flush()
+    return passed, failed, tgt_passed, tgt_failed, proc.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run cargo tests for codex-rs and summarize the results."
+    )
+    parser.add_argument(
+        "--target-pattern",
+        help="Also summarize only the tests whose names match this regular expression.",
+    )
+    args = parser.parse_args()
+
+    passed, failed, tgt_passed, tgt_failed, code = run_tests(args.target_pattern)
+    print(f"total: {passed} passed; {failed} failed")
+    if args.target_pattern:
+        print(f"target '{args.target_pattern}': {tgt_passed} passed; {tgt_failed} failed")
+
+    return 1 if failed or code else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())